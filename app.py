@@ -6,9 +6,12 @@ load_dotenv()
 
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
+import altair as alt
 import datetime
 import pytz
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
 from linkedin_scraper import scrape_linkedin_profile
 from data_analyzer import (
     analyze_post_engagement,
@@ -16,7 +19,6 @@ from data_analyzer import (
     analyze_content_themes,
     get_optimal_posting_time
 )
-from content_generator import generate_post, update_feedback_preferences
 from database import (
     initialize_database,
     get_posts,
@@ -24,6 +26,7 @@ from database import (
     update_post_feedback,
     get_post_feedback_stats,
     get_post_feedback,
+    get_data_version,
     insert_sample_feedback
 )
 from utils import load_profile_data, parse_url
@@ -38,6 +41,119 @@ st.set_page_config(
 # Initialize the database
 initialize_database()
 
+# Cached reads, keyed by the database write counter so they refresh after any save
+@st.cache_data(ttl=300)
+def _cached_posts(version):
+    """
+    Returns all scraped posts, cached per data version.
+    
+    Args:
+        version (int): Database data version, used only as the cache key
+        
+    Returns:
+        pd.DataFrame: DataFrame containing all posts
+    """
+    return get_posts()
+
+def _categorize_feedback(feedback_df):
+    """
+    Converts the low-cardinality feedback columns to categoricals, in place.
+    
+    Args:
+        feedback_df (pd.DataFrame): Generated posts with their feedback
+        
+    Returns:
+        pd.DataFrame: The same DataFrame
+    """
+    # Few distinct values, so masks and groupbys compare integer codes instead of strings
+    for col in ('feedback', 'tone', 'topic'):
+        feedback_df[col] = feedback_df[col].astype('category')
+    return feedback_df
+
+@st.cache_data(ttl=300)
+def _cached_feedback(version):
+    """
+    Returns all generated posts with their feedback, cached per data version.
+    
+    Args:
+        version (int): Database data version, used only as the cache key
+        
+    Returns:
+        pd.DataFrame: Generated posts with categorical feedback, tone and topic
+    """
+    return _categorize_feedback(get_post_feedback())
+
+# Worker threads for blocking database calls, shared across reruns and sessions
+@st.cache_resource
+def _io_pool():
+    """
+    Returns the thread pool used for blocking database reads.
+    
+    Returns:
+        ThreadPoolExecutor: Shared executor with four workers
+    """
+    return ThreadPoolExecutor(max_workers=4)
+
+def _fetch_feedback_data():
+    """Loads feedback rows and feedback statistics concurrently."""
+    # Only the raw statistics query goes to a worker; st.cache_data needs the script thread
+    stats_future = _io_pool().submit(get_post_feedback_stats)
+    feedback_df = _cached_feedback(get_data_version())
+    return feedback_df, stats_future.result()
+
+class InsightsBundle(NamedTuple):
+    """Precomputed analytics for the Content Insights page."""
+    engagement: pd.Series
+    themes: dict
+    timing: pd.Series
+    optimal: str
+    lengths: np.ndarray
+
+# All Content Insights analytics, computed once per distinct posts DataFrame
+@st.cache_data(hash_funcs={pd.DataFrame: lambda d: (len(d), int(pd.util.hash_pandas_object(d, index=False).sum()))})
+def _insights_bundle(posts_df):
+    """
+    Computes every analytic shown on the Content Insights page.
+    
+    Args:
+        posts_df (pd.DataFrame): DataFrame containing post data
+        
+    Returns:
+        InsightsBundle: Engagement, themes, timing, optimal time and content lengths
+    """
+    timing = analyze_posting_patterns(posts_df)
+    return InsightsBundle(
+        engagement=analyze_post_engagement(posts_df),
+        themes=analyze_content_themes(posts_df),
+        timing=timing,
+        optimal=get_optimal_posting_time(posts_df, timing),
+        lengths=posts_df['content_length'].to_numpy()
+    )
+
+# Columns narrowed before tables are sent to the browser
+_DISPLAY_NUMERIC = ('likes', 'comments', 'shares', 'content_length', 'connections', 'engagement', 'avg_engagement')
+_DISPLAY_CATEGORIES = ('type', 'theme', 'content_length_type')
+
+def _compact_for_display(df):
+    """Downcasts known numeric columns, never widening them, and categorizes labels before rendering a table."""
+    compact = {}
+    for col in df.columns.intersection(_DISPLAY_NUMERIC):
+        # Integers stay integers; only the width shrinks to what the values need
+        kind = 'integer' if pd.api.types.is_integer_dtype(df[col]) else 'float'
+        compact[col] = pd.to_numeric(df[col], downcast=kind)
+    for col in df.columns.intersection(_DISPLAY_CATEGORIES):
+        compact[col] = df[col].astype('category')
+    return df.assign(**compact)
+
+def _ranked_bar_chart(labels, values, x_label, y_label):
+    """Draws a bar chart that keeps the bars in the given order."""
+    chart_df = pd.DataFrame({x_label: labels, y_label: values})
+    chart = alt.Chart(chart_df).mark_bar().encode(
+        x=alt.X(f"{x_label}:N", sort=None),
+        y=alt.Y(f"{y_label}:Q")
+    )
+    st.altair_chart(chart, width="stretch")
+
 # Load target profile data
 TARGET_PROFILE = "https://www.linkedin.com/in/archit-anand/"
 COMPETITOR_PROFILES = [
@@ -62,21 +178,22 @@ page = st.sidebar.radio(
 if page == "Profile Analysis":
     st.header("LinkedIn Profile Analysis")
     
-    # Profile selection
-    profile_option = st.selectbox(
-        "Select a profile to analyze",
-        [TARGET_PROFILE] + COMPETITOR_PROFILES
-    )
+    # Profile selection, submitted together with the scrape button
+    with st.form("profile_form"):
+        profile_option = st.selectbox(
+            "Select a profile to analyze",
+            [TARGET_PROFILE] + COMPETITOR_PROFILES
+        )
+        submitted = st.form_submit_button("Scrape and Analyze Profile")
     
-    # Scrape and analyze button
-    if st.button("Scrape and Analyze Profile"):
+    if submitted:
         with st.spinner("Scraping profile data... (This may take a moment)"):
             try:
                 profile_data = scrape_linkedin_profile(profile_option)
                 if profile_data:
-                    # Save profile data to database
+                    # Save profile data to database while the results are rendered
                     from database import save_profile
-                    save_profile(profile_data)
+                    save_future = _io_pool().submit(save_profile, profile_data)
                     
                     st.success(f"Successfully scraped profile: {profile_data['name']}")
                     
@@ -91,14 +208,15 @@ if page == "Profile Analysis":
                     
                     with col2:
                         st.subheader("Activity Overview")
-                        st.write(f"**Total Posts:** {len(profile_data['posts'])}")
+                        st.write(f"**Total Posts:** {len(profile_data['columns']['content'])}")
                         st.write(f"**Average Engagement:** {profile_data['avg_engagement']:.1f}")
                     
                     # Display recent posts
                     st.subheader("Recent Posts")
-                    posts_df = pd.DataFrame(profile_data['posts'])
-                    st.dataframe(posts_df)
+                    posts_df = pd.DataFrame(profile_data['columns'])
+                    st.dataframe(_compact_for_display(posts_df))
                     
+                    save_future.result()
                     st.info("Profile data has been saved. You can now view insights in the 'Content Insights' section.")
                 else:
                     st.error("Failed to retrieve profile data. Please try again.")
@@ -111,35 +229,30 @@ if page == "Profile Analysis":
     if scraped_profiles.empty:
         st.info("No profiles have been analyzed yet.")
     else:
-        st.dataframe(scraped_profiles)
+        st.dataframe(_compact_for_display(scraped_profiles))
 
 elif page == "Content Insights":
     st.header("Content Insights & Trends")
     
     # Get stored data
-    posts_df = get_posts()
+    posts_df = _cached_posts(get_data_version())
     
     if posts_df.empty:
         st.warning("No data available. Please scrape LinkedIn profiles first.")
     else:
+        insights = _insights_bundle(posts_df)
+        
         # Engagement analysis
         st.subheader("Engagement Analysis")
         col1, col2 = st.columns(2)
         
         with col1:
-            fig, ax = plt.subplots(figsize=(10, 6))
-            engagement_data = analyze_post_engagement(posts_df)
-            engagement_data.plot(kind='bar', ax=ax)
-            plt.title("Average Engagement by Content Type")
-            plt.ylabel("Engagement Score")
-            plt.xlabel("Content Type")
-            plt.tight_layout()
-            st.pyplot(fig)
+            st.markdown("**Average Engagement by Content Type**")
+            _ranked_bar_chart(insights.engagement.index, insights.engagement.to_numpy(), "Content Type", "Engagement Score")
         
         with col2:
             st.write("Key Insights:")
-            content_themes = analyze_content_themes(posts_df)
-            for content_type, stats in content_themes.items():
+            for content_type, stats in insights.themes.items():
                 if 'observation' in stats:
                     st.write(f"**{content_type}**: {stats['observation']}")
                 elif 'avg_engagement' in stats:
@@ -147,110 +260,108 @@ elif page == "Content Insights":
         
         # Posting patterns
         st.subheader("Posting Patterns")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        time_data = analyze_posting_patterns(posts_df)
-        time_data.plot(kind='line', marker='o', ax=ax)
-        plt.title("Posting Time vs Engagement")
-        plt.ylabel("Average Engagement")
-        plt.xlabel("Hour of Day")
-        plt.grid(True, linestyle='--', alpha=0.7)
-        plt.tight_layout()
-        st.pyplot(fig)
+        st.markdown("**Posting Time vs Engagement**")
+        st.line_chart(insights.timing, x_label="Hour of Day", y_label="Average Engagement")
         
-        optimal_time = get_optimal_posting_time(posts_df)
-        st.info(f"**Optimal posting time**: {optimal_time}")
+        st.info(f"**Optimal posting time**: {insights.optimal}")
         
         # Content length analysis
         st.subheader("Content Length Analysis")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        posts_df['content_length'] = posts_df['content'].apply(len)
-        posts_df.plot.scatter(x='content_length', y='engagement', ax=ax, alpha=0.6)
-        plt.title("Content Length vs. Engagement")
-        plt.xlabel("Content Length (characters)")
-        plt.ylabel("Engagement")
-        plt.grid(True, linestyle='--', alpha=0.5)
-        st.pyplot(fig)
+        st.markdown("**Content Length vs. Engagement**")
+        st.scatter_chart(
+            pd.DataFrame({"length": insights.lengths, "engagement": posts_df['engagement'].to_numpy()}),
+            x="length",
+            y="engagement",
+            x_label="Content Length (characters)",
+            y_label="Engagement"
+        )
 
 elif page == "Post Generator":
-    st.header("AI Post Generator")
+    # Imported here so the other pages don't pay for loading the Gemini client
+    from content_generator import generate_post
     
-    # Topic input
-    topic = st.text_input("Enter a topic or theme for your post:")
+    st.header("AI Post Generator")
     
-    # Additional prompts
-    with st.expander("Advanced Options"):
-        tone = st.select_slider(
-            "Select tone:",
-            options=["Professional", "Conversational", "Inspirational", "Educational", "Promotional"]
-        )
-        include_cta = st.checkbox("Include a call-to-action", value=True)
-        max_length = st.slider("Maximum post length", 100, 1000, 500)
-        include_hashtags = st.checkbox("Include hashtags", value=True)
-        num_hashtags = st.slider("Number of hashtags", 1, 10, 3) if include_hashtags else 0
-
     # Suggest optimal posting time
-    posts_df = get_posts()
-    default_time = None
-    suggested_time_str = "09:00" # Fallback
+    posts_df = _cached_posts(get_data_version())
+    default_date = datetime.datetime.now().date() + datetime.timedelta(days=1)
+    default_time = datetime.time(9, 0)  # Default to 9:00 AM
     if not posts_df.empty:
         optimal_time = get_optimal_posting_time(posts_df)
         st.info(f"**Suggested optimal posting time:** {optimal_time}")
         
-        # Try to parse hour (in format like 'Wednesday 11:00')
+        # If optimal_time is parsed (in format like 'Wednesday 11:00'), use its hour:minute
         try:
-            splitted = optimal_time.split(' ')
-            if len(splitted) == 2:
-                _day, timepart = splitted
-                suggested_time_str = timepart
-                # Set default date to tomorrow at optimal hour
-                default_time = datetime.datetime.now() + datetime.timedelta(days=1)
-                default_time = default_time.replace(
-                    hour=int(timepart.split(':')[0]), minute=int(timepart.split(':')[1]), second=0, microsecond=0
-                )
+            splitted = optimal_time.split(" ")
+            if len(splitted) == 2 and ':' in splitted[1]:
+                hr, mn = map(int, splitted[1].split(":"))
+                default_time = datetime.time(hr, mn)
         except Exception:
-            default_time = None
+            pass
     
-    st.markdown("#### Schedule this post for later?")
-    schedule_post = st.checkbox("Schedule post at a specific time", value=True)
-
-    scheduled_datetime = None
-    if schedule_post:
-        # Default values
-        default_date = datetime.datetime.now().date() + datetime.timedelta(days=1)
-        default_time = datetime.time(9, 0)  # Default to 9:00 AM
-
-        # If optimal_time is parsed, try to use its hour:minute
-        if not posts_df.empty:
-            optimal_time = get_optimal_posting_time(posts_df)
-            try:
-                splitted = optimal_time.split(" ")
-                if len(splitted) == 2 and ':' in splitted[1]:
-                    hr, mn = map(int, splitted[1].split(":"))
-                    default_time = datetime.time(hr, mn)
-            except Exception:
-                pass
-
+    # Inputs are batched in a form so adjusting them doesn't rerun the page
+    with st.form("post_gen_form"):
+        # Topic input
+        topic = st.text_input("Enter a topic or theme for your post:")
+        
+        # Additional prompts
+        with st.expander("Advanced Options"):
+            tone = st.select_slider(
+                "Select tone:",
+                options=["Professional", "Conversational", "Inspirational", "Educational", "Promotional"]
+            )
+            include_cta = st.checkbox("Include a call-to-action", value=True)
+            max_length = st.slider("Maximum post length", 100, 1000, 500)
+            include_hashtags = st.checkbox("Include hashtags", value=True)
+            # Form widgets can't react to each other, so this is ignored when hashtags are off
+            num_hashtags = st.slider("Number of hashtags", 1, 10, 3)
+        
+        st.markdown("#### Schedule this post for later?")
+        schedule_post = st.checkbox("Schedule post at a specific time", value=True)
         date_part = st.date_input("Date to post", value=default_date, min_value=datetime.datetime.now().date())
         time_part = st.time_input("Time to post", value=default_time, step=900)  # Step in seconds (15 min = 900 sec)
-        scheduled_datetime = datetime.datetime.combine(date_part, time_part)
+        
+        submitted = st.form_submit_button("Generate Post")
     
-    # Generate post button
-    if st.button("Generate Post"):
+    if not include_hashtags:
+        num_hashtags = 0
+    scheduled_datetime = datetime.datetime.combine(date_part, time_part) if schedule_post else None
+    
+    # Generate posts on submit
+    if submitted:
         if not topic:
             st.warning("Please enter a topic for your post.")
         else:
             with st.spinner("Generating post variations..."):
                 try:
-                    post_variations = generate_post(
+                    # Show each variation's raw response as it streams in
+                    stream_area = st.empty()
+                    stream_box = stream_area.container()
+                    stream_slots = {}
+                    stream_text = {}
+                    
+                    def show_progress(index, chunk):
+                        if index not in stream_slots:
+                            stream_slots[index] = stream_box.empty()
+                            stream_text[index] = ""
+                        stream_text[index] += chunk
+                        stream_slots[index].code(stream_text[index], language="json")
+                    
+                    post_variations, suggested_hashtags = generate_post(
                         topic=topic,
                         tone=tone,
                         include_cta=include_cta,
                         max_length=max_length,
                         include_hashtags=include_hashtags,
-                        num_hashtags=num_hashtags
+                        num_hashtags=num_hashtags,
+                        on_progress=show_progress
                     )
+                    stream_area.empty()
                     
                     if post_variations:
+                        if suggested_hashtags:
+                            st.write(f"**Suggested hashtags:** {' '.join(suggested_hashtags)}")
+                        
                         # Display post variations with feedback options
                         for i, post in enumerate(post_variations):
                             st.subheader(f"Variation {i+1}")
@@ -279,15 +390,12 @@ elif page == "Feedback Dashboard":
     st.header("Feedback & Learning Dashboard")
     
     # Get feedback data
-    feedback_df = get_post_feedback()
-    feedback_stats = get_post_feedback_stats()
+    feedback_df, feedback_stats = _fetch_feedback_data()
     
-    # If no feedback, insert sample feedback (only if database is empty)
+    # If no feedback, insert sample feedback (only if database is empty) and use the rows it returns
     if feedback_df.empty:
-        # Try to insert sample feedback
-        insert_sample_feedback()
-        feedback_df = get_post_feedback()
-        feedback_stats = get_post_feedback_stats()
+        feedback_df, feedback_stats = insert_sample_feedback()
+        feedback_df = _categorize_feedback(feedback_df)
     
     # Show scheduled (future) posts
     with st.expander("⏰ View Scheduled Posts"):
@@ -299,7 +407,7 @@ elif page == "Feedback Dashboard":
             st.write("These posts are scheduled for publishing at optimal/future times.")
             st.dataframe(
                 scheduled_df[["topic", "tone", "scheduled_time", "content"]].sort_values("scheduled_time"),
-                use_container_width=True
+                width="stretch"
             )
     
     # Display feedback overview
@@ -319,57 +427,49 @@ elif page == "Feedback Dashboard":
         # Tone effectiveness chart
         tone_data = feedback_stats["tone_effectiveness"]
         if tone_data:
-            fig, ax = plt.subplots(figsize=(10, 5))
-            pd.Series(tone_data).plot(kind='bar', ax=ax)
-            plt.title("Positive Feedback Rate by Tone")
-            plt.ylabel("Positive Feedback Rate (%)")
-            plt.xlabel("Tone")
-            plt.tight_layout()
-            st.pyplot(fig)
+            st.markdown("**Positive Feedback Rate by Tone**")
+            tones, tone_rates = zip(*sorted(tone_data.items(), key=lambda kv: -kv[1]))
+            _ranked_bar_chart(tones, tone_rates, "Tone", "Positive Feedback Rate (%)")
         
         # Feedback trends over time
         st.subheader("Feedback Trends Over Time")
         if "feedback_trend" in feedback_stats and not feedback_stats["feedback_trend"].empty:
-            fig, ax = plt.subplots(figsize=(10, 5))
-            feedback_stats["feedback_trend"].plot(ax=ax)
-            plt.title("Feedback Trends Over Time")
-            plt.ylabel("Positive Feedback Rate (%)")
-            plt.xlabel("Generation Date")
-            plt.grid(True, linestyle='--', alpha=0.7)
-            plt.tight_layout()
-            st.pyplot(fig)
+            st.line_chart(feedback_stats["feedback_trend"], x_label="Generation Date", y_label="Positive Feedback Rate (%)")
         
         # Display actual posts with feedback
         st.subheader("Recent Generated Posts")
         
+        # Sort once and slice per tab
+        sorted_fb = feedback_df.sort_values('generation_time', ascending=False)
+        
         # Create tabs for different feedback types
         tab1, tab2, tab3 = st.tabs(["All Posts", "Positive Feedback", "Needs Improvement"])
         
         with tab1:
             if not feedback_df.empty:
-                for i, row in feedback_df.sort_values('generation_time', ascending=False).head(5).iterrows():
-                    st.markdown(f"**Topic: {row['topic']}** | Tone: {row['tone']} | Feedback: {row['feedback']}")
-                    st.markdown(f"{row['content']}")
+                for row in sorted_fb.head(5).itertuples(index=False):
+                    st.markdown(f"**Topic: {row.topic}** | Tone: {row.tone} | Feedback: {row.feedback}")
+                    st.markdown(f"{row.content}")
                     st.markdown("---")
             else:
                 st.info("No posts available")
         
         with tab2:
-            positive_df = feedback_df[feedback_df['feedback'] == 'positive']
+            positive_df = sorted_fb[sorted_fb['feedback'] == 'positive']
             if not positive_df.empty:
-                for i, row in positive_df.sort_values('generation_time', ascending=False).head(5).iterrows():
-                    st.markdown(f"**Topic: {row['topic']}** | Tone: {row['tone']} | 👍 Positive Feedback")
-                    st.markdown(f"{row['content']}")
+                for row in positive_df.head(5).itertuples(index=False):
+                    st.markdown(f"**Topic: {row.topic}** | Tone: {row.tone} | 👍 Positive Feedback")
+                    st.markdown(f"{row.content}")
                     st.markdown("---")
             else:
                 st.info("No posts with positive feedback yet")
         
         with tab3:
-            negative_df = feedback_df[feedback_df['feedback'] == 'negative']
+            negative_df = sorted_fb[sorted_fb['feedback'] == 'negative']
             if not negative_df.empty:
-                for i, row in negative_df.sort_values('generation_time', ascending=False).head(5).iterrows():
-                    st.markdown(f"**Topic: {row['topic']}** | Tone: {row['tone']} | 👎 Needs Improvement")
-                    st.markdown(f"{row['content']}")
+                for row in negative_df.head(5).itertuples(index=False):
+                    st.markdown(f"**Topic: {row.topic}** | Tone: {row.tone} | 👎 Needs Improvement")
+                    st.markdown(f"{row.content}")
                     st.markdown("---")
             else:
                 st.info("No posts with negative feedback yet")
@@ -377,22 +477,18 @@ elif page == "Feedback Dashboard":
         # Topic effectiveness
         st.subheader("Topic Effectiveness")
         if not feedback_df.empty and 'topic' in feedback_df.columns:
-            topic_data = {}
-            for topic in feedback_df['topic'].unique():
-                topic_posts = feedback_df[feedback_df['topic'] == topic]
-                topic_positive = len(topic_posts[topic_posts['feedback'] == 'positive'])
-                topic_total = len(topic_posts)
-                topic_data[topic] = (topic_positive / topic_total) * 100 if topic_total > 0 else 0
+            # Positive feedback rate per topic in a single grouped pass
+            topic_rates = (
+                feedback_df.assign(positive=(feedback_df['feedback'] == 'positive').astype('int8'))
+                .groupby('topic', sort=False, observed=True)['positive']
+                .mean()
+                .mul(100)
+            )
             
-            if topic_data:
-                fig, ax = plt.subplots(figsize=(10, 5))
-                pd.Series(topic_data).sort_values(ascending=False).plot(kind='bar', ax=ax)
-                plt.title("Positive Feedback Rate by Topic")
-                plt.ylabel("Positive Feedback Rate (%)")
-                plt.xlabel("Topic")
-                plt.xticks(rotation=45, ha='right')
-                plt.tight_layout()
-                st.pyplot(fig)
+            if not topic_rates.empty:
+                st.markdown("**Positive Feedback Rate by Topic**")
+                topic_rates = topic_rates.sort_values(ascending=False)
+                _ranked_bar_chart(topic_rates.index, topic_rates.to_numpy(), "Topic", "Positive Feedback Rate (%)")
         
     else:
         st.info("No feedback data available yet. Generate and rate some posts to see insights.")
@@ -1,15 +1,36 @@
 import os
 import json
+import re
+import asyncio
+import hashlib
 import random
+import functools
+import threading
+import time
+from collections import OrderedDict
 import pandas as pd
 from datetime import datetime
 import google.generativeai as genai
-from database import get_post_feedback, get_posts
+from database import get_posts
+
+try:
+    import streamlit as st
+except ImportError:  # Allow use outside of the Streamlit app
+    st = None
+
+try:
+    import orjson
+    _json_loads = orjson.loads  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+except ImportError:
+    _json_loads = json.loads
 
 # Initialize Google's Gemini AI
 GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY")
 genai.configure(api_key=GOOGLE_API_KEY)
 
+# Share long-lived objects across reruns when running under Streamlit
+_cache_resource = st.cache_resource if st is not None else functools.lru_cache(maxsize=None)
+
 # Global preferences based on user feedback
 user_preferences = {
     'preferred_tone': 'Conversational',
@@ -18,7 +39,348 @@ user_preferences = {
     'hashtag_preference': True
 }
 
-def generate_post(topic, tone="Conversational", include_cta=True, max_length=500, include_hashtags=True, num_hashtags=3):
+@_cache_resource
+def _get_gemini_model(max_tokens):
+    """
+    Returns a configured Gemini model, created once per output token limit.
+    
+    Args:
+        max_tokens (int): Maximum number of output tokens
+        
+    Returns:
+        genai.GenerativeModel: Configured Gemini model
+    """
+    generation_config = {
+        "temperature": 0.7,
+        "top_p": 0.9,
+        "top_k": 40,
+        "max_output_tokens": max_tokens,
+    }
+    
+    # Setting up the model with Gemini-1.5-pro
+    return genai.GenerativeModel(
+        model_name="gemini-1.5-pro",
+        generation_config=generation_config
+    )
+
+def _prompt_hash(prompt):
+    """Returns a short, stable cache key for a prompt."""
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+# Gemini responses per (prompt hash, token limit), least recently used first.
+# Kept in-process rather than in st.cache_data so worker threads never touch Streamlit.
+_RESPONSE_CACHE = OrderedDict()
+_RESPONSE_CACHE_SIZE = 64
+_RESPONSE_TTL = 3600
+_response_lock = threading.Lock()
+
+def _cached_response(key):
+    """
+    Returns a cached Gemini response, or None if there is none from within the hour.
+    
+    Args:
+        key (tuple): (prompt hash, max tokens)
+        
+    Returns:
+        str: Raw response text, or None
+    """
+    with _response_lock:
+        entry = _RESPONSE_CACHE.get(key)
+        if entry is None:
+            return None
+        stored_at, text = entry
+        if time.monotonic() - stored_at > _RESPONSE_TTL:
+            del _RESPONSE_CACHE[key]
+            return None
+        _RESPONSE_CACHE.move_to_end(key)
+        return text
+
+def _store_response(key, text):
+    """
+    Caches a Gemini response, evicting the least recently used one when full.
+    
+    Args:
+        key (tuple): (prompt hash, max tokens)
+        text (str): Raw response text
+    """
+    with _response_lock:
+        _RESPONSE_CACHE[key] = (time.monotonic(), text)
+        _RESPONSE_CACHE.move_to_end(key)
+        if len(_RESPONSE_CACHE) > _RESPONSE_CACHE_SIZE:
+            _RESPONSE_CACHE.popitem(last=False)
+
+def _generate_text(model, prompt, on_chunk=None):
+    """
+    Sends a prompt to Gemini, without caching. Safe to run in a worker thread.
+    
+    Args:
+        model (genai.GenerativeModel): Model from _get_gemini_model
+        prompt (str): Prompt text
+        on_chunk (callable, optional): If given, the response is streamed and
+            each text chunk is passed to it as it arrives
+        
+    Returns:
+        str: Raw response text
+    """
+    if on_chunk is None:
+        return model.generate_content(prompt).text
+    
+    parts = []
+    for chunk in model.generate_content(prompt, stream=True):
+        parts.append(chunk.text)
+        on_chunk(chunk.text)
+    return "".join(parts)
+
+def _call_gemini(prompt, max_tokens):
+    """
+    Sends a prompt to Gemini. Repeating an identical prompt within the hour reuses the response.
+    
+    Args:
+        prompt (str): Prompt text
+        max_tokens (int): Maximum number of output tokens
+        
+    Returns:
+        str: Raw response text
+    """
+    key = (_prompt_hash(prompt), max_tokens)
+    text = _cached_response(key)
+    if text is None:
+        text = _generate_text(_get_gemini_model(max_tokens), prompt)
+        _store_response(key, text)
+    return text
+
+# Hashtags found in free-text responses
+_HASHTAG_RE = re.compile(r'#\w+')
+
+# Static parts of the post prompt
+_PROMPT_HEAD = (
+    "You are a LinkedIn content expert who creates engaging posts that drive high engagement.\n\n"
+    "Create a LinkedIn post about "
+)
+_PROMPT_TAIL = """
+Make sure the post is professional, engaging, and optimized for LinkedIn's algorithm.
+
+Return the post in this JSON format:
+{
+  "posts": [
+    {
+      "content": "Post content here",
+      "estimated_engagement": 0-100
+    }
+  ],
+  "hashtags": ["#Hashtag"]
+}
+
+Only return the JSON, nothing else. Make sure the JSON is properly formatted and valid.
+"""
+
+# Guideline lines, indexed by the request flags
+_CTA = ('No call-to-action needed', 'Include a call-to-action')
+_HASHTAGS_ON = 'Include {n} relevant hashtags and list them in the hashtags array'
+_HASHTAGS_OFF = 'No hashtags needed, leave the hashtags array empty'
+
+# Openers used to steer each variation towards a different structure
+_VARIATION_ANGLES = (
+    "Open with a bold statement or surprising fact",
+    "Open with a short personal story or experience",
+    "Open with a thought-provoking question",
+)
+
+async def _gen_variation(prompt, on_chunk=None):
+    """
+    Requests a single post variation from Gemini without blocking the event loop.
+    
+    Args:
+        prompt (str): Prompt for this variation
+        on_chunk (callable, optional): Called with each streamed text chunk, on the
+            event loop's thread rather than the worker thread
+        
+    Returns:
+        tuple: (posts, hashtags) parsed from the response
+    """
+    forward = None
+    if on_chunk is not None:
+        loop = asyncio.get_running_loop()
+        
+        def forward(text):
+            loop.call_soon_threadsafe(on_chunk, text)
+    # The cache is checked and filled here; only the request itself runs in the worker
+    key = (_prompt_hash(prompt), 1500)
+    text = _cached_response(key)
+    if text is None:
+        text = await asyncio.to_thread(_generate_text, _get_gemini_model(1500), prompt, forward)
+        _store_response(key, text)
+    payload = _parse_json_payload(text)
+    return payload["posts"], payload.get("hashtags") or []
+
+async def _gather_variations(prompts, on_progress=None):
+    """
+    Runs all variation requests concurrently.
+    
+    Args:
+        prompts (list): One prompt per variation
+        on_progress (callable, optional): Called as on_progress(index, chunk) for
+            each streamed chunk of the index-th variation
+        
+    Returns:
+        list: (posts, hashtags) per prompt. Failed requests are returned as exceptions.
+    """
+    tasks = [
+        _gen_variation(prompt, functools.partial(on_progress, i) if on_progress else None)
+        for i, prompt in enumerate(prompts)
+    ]
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+def _extract_json_object(text):
+    """
+    Finds the first complete JSON object in text by matching braces.
+    
+    Args:
+        text (str): Text that may contain a JSON object
+        
+    Returns:
+        str: The JSON object text, or None if no complete object is found
+    """
+    start = text.find('{')
+    if start == -1:
+        return None
+    
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+def _parse_json_payload(text):
+    """
+    Parses the JSON object from a Gemini response.
+    
+    Args:
+        text (str): Raw response text
+        
+    Returns:
+        dict: The parsed object
+    """
+    # Gemini sometimes wraps its answer in a ```json fence
+    text = text.strip()
+    if text.startswith('```'):
+        text = text.split('\n', 1)[1] if '\n' in text else ''
+        text = text.rsplit('```', 1)[0]
+    
+    try:
+        return _json_loads(text)
+    except json.JSONDecodeError:
+        # If JSON parsing fails, try to extract JSON from the response text
+        payload = _extract_json_object(text)
+        if payload is None:
+            raise ValueError("Could not parse JSON from Gemini response")
+        return _json_loads(payload)
+
+def _posts_fingerprint(posts_df):
+    """
+    Computes a cheap content hash of the posts data, used as a cache key.
+    Large tables are sampled at both ends so the cost stays bounded.
+    
+    Args:
+        posts_df (pd.DataFrame): DataFrame containing post data
+        
+    Returns:
+        tuple: (row count, hash of the sampled rows)
+    """
+    if posts_df.empty:
+        return (0, 0)
+    sample = posts_df if len(posts_df) <= 2000 else pd.concat([posts_df.head(1000), posts_df.tail(1000)])
+    return (len(posts_df), int(pd.util.hash_pandas_object(sample, index=False).sum()))
+
+# Columns read by _compute_insights
+_INSIGHT_COLUMNS = ('theme', 'has_questions', 'content_length_type', 'engagement')
+
+# Insights text per posts fingerprint, least recently used first
+_INSIGHTS_CACHE = OrderedDict()
+_INSIGHTS_CACHE_SIZE = 16
+_insights_lock = threading.Lock()
+
+def _get_insights(posts_df):
+    """
+    Returns the insights text for the posts data, reusing it while the data is unchanged.
+    
+    Args:
+        posts_df (pd.DataFrame): DataFrame containing post data
+        
+    Returns:
+        str: Insights text
+    """
+    key = _posts_fingerprint(posts_df)
+    with _insights_lock:
+        if key in _INSIGHTS_CACHE:
+            _INSIGHTS_CACHE.move_to_end(key)
+            return _INSIGHTS_CACHE[key]
+    
+    insights = _compute_insights(posts_df)
+    with _insights_lock:
+        _INSIGHTS_CACHE[key] = insights
+        if len(_INSIGHTS_CACHE) > _INSIGHTS_CACHE_SIZE:
+            _INSIGHTS_CACHE.popitem(last=False)
+    return insights
+
+def _compute_insights(posts_df):
+    """
+    Summarizes what performs well in the scraped posts, for use in the prompt.
+    
+    Args:
+        posts_df (pd.DataFrame): DataFrame containing post data
+        
+    Returns:
+        str: Insights text
+    """
+    insights = ""
+    keys = [col for col in ('theme', 'has_questions', 'content_length_type') if col in posts_df.columns]
+    if posts_df.empty or not keys:
+        return insights
+    
+    # Group once by every key, then roll the small result up to each column's average
+    grouped = posts_df.groupby(keys, dropna=False, observed=True)['engagement'].agg(['sum', 'count'])
+    
+    def mean_engagement_by(col):
+        totals = grouped.groupby(level=col, observed=True).sum()
+        return totals['sum'] / totals['count']
+    
+    # Find top performing content types
+    if 'theme' in keys:
+        top_themes = mean_engagement_by('theme').nlargest(3).index.tolist()
+        insights += f"Top performing themes: {', '.join(top_themes)}. "
+    
+    # Check if questions perform well
+    if 'has_questions' in keys:
+        question_performance = mean_engagement_by('has_questions')
+        if True in question_performance and False in question_performance:
+            if question_performance[True] > question_performance[False]:
+                insights += "Posts with questions perform better. "
+    
+    # Check optimal length
+    if 'content_length_type' in keys:
+        length_performance = mean_engagement_by('content_length_type').nlargest(1).index[0]
+        insights += f"Posts with {length_performance} length perform best. "
+    
+    return insights
+
+def generate_post(topic, tone="Conversational", include_cta=True, max_length=500, include_hashtags=True, num_hashtags=3, on_progress=None):
     """
     Generates LinkedIn post variations using Google's Gemini AI.
     
@@ -29,102 +391,57 @@ def generate_post(topic, tone="Conversational", include_cta=True, max_length=500
         max_length (int): Maximum length of the post
         include_hashtags (bool): Whether to include hashtags
         num_hashtags (int): Number of hashtags to include
+        on_progress (callable, optional): Receives (variation index, text chunk) while
+            responses stream in, on the calling thread
         
     Returns:
-        list: List of generated post variations
+        tuple: (list of generated post variations, list of suggested hashtags)
     """
     try:
-        # Get engagement data to inform the prompt
-        posts_df = get_posts()
-        feedback_data = get_post_feedback()
+        # Get engagement data to inform the prompt, leaving out the post text
+        posts_df = get_posts(columns=_INSIGHT_COLUMNS)
         
         # Analyze what works well
-        insights = ""
-        if not posts_df.empty:
-            # Find top performing content types
-            if 'theme' in posts_df.columns:
-                top_themes = posts_df.groupby('theme')['engagement'].mean().nlargest(3).index.tolist()
-                insights += f"Top performing themes: {', '.join(top_themes)}. "
-            
-            # Check if questions perform well
-            if 'has_questions' in posts_df.columns:
-                question_performance = posts_df.groupby('has_questions')['engagement'].mean()
-                if True in question_performance and False in question_performance:
-                    if question_performance[True] > question_performance[False]:
-                        insights += "Posts with questions perform better. "
-            
-            # Check optimal length
-            if 'content_length_type' in posts_df.columns:
-                length_performance = posts_df.groupby('content_length_type')['engagement'].mean().nlargest(1).index[0]
-                insights += f"Posts with {length_performance} length perform best. "
+        insights = _get_insights(posts_df)
         
-        # Configure Gemini model
-        generation_config = {
-            "temperature": 0.7,
-            "top_p": 0.9,
-            "top_k": 40,
-            "max_output_tokens": 1500,
-        }
-        
-        # Setting up the model with Gemini-1.5-pro
-        model = genai.GenerativeModel(
-            model_name="gemini-1.5-pro",
-            generation_config=generation_config
+        # Only the short per-request fields are formatted; the static text is shared
+        guidelines = (
+            f"{topic}.\n\n"
+            "Guidelines:\n"
+            f"- Tone: {tone}\n"
+            f"- Maximum length: {max_length} characters\n"
+            f"- {_CTA[bool(include_cta)]}\n"
+            f"- {_HASHTAGS_ON.format(n=num_hashtags) if include_hashtags else _HASHTAGS_OFF}\n"
         )
+        prompts = [
+            f"{_PROMPT_HEAD}{guidelines}- {angle}\n\nInsights from performance data:\n{insights}\n{_PROMPT_TAIL}"
+            for angle in _VARIATION_ANGLES
+        ]
         
-        # System instruction and prompt
-        system_instruction = "You are a LinkedIn content expert who creates engaging posts that drive high engagement."
-        
-        # Prompt engineering for LinkedIn posts
-        prompt = f"""
-        {system_instruction}
-        
-        Create 3 variations of a LinkedIn post about {topic}.
-        
-        Guidelines:
-        - Tone: {tone}
-        - Maximum length: {max_length} characters
-        - {include_cta and 'Include a call-to-action' or 'No call-to-action needed'}
-        - {include_hashtags and f'Include {num_hashtags} relevant hashtags' or 'No hashtags needed'}
-        
-        Insights from performance data:
-        {insights}
-        
-        Make sure the posts are professional, engaging, and optimized for LinkedIn's algorithm.
-        Each variation should be different in structure and approach while maintaining the core message.
+        # Generate all variations concurrently; each response carries its own hashtags
+        results = asyncio.run(_gather_variations(prompts, on_progress))
         
-        Return the posts in this JSON format:
-        {{
-          "posts": [
-            {{
-              "content": "Post content here",
-              "estimated_engagement": 0-100
-            }},
-            ...more posts
-          ]
-        }}
+        posts = []
+        hashtags = []
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"Error generating post variation: {str(result)}")
+                continue
+            variation_posts, variation_hashtags = result
+            posts.extend(variation_posts)
+            if include_hashtags and not hashtags:
+                hashtags = variation_hashtags[:num_hashtags]
         
-        Only return the JSON, nothing else. Make sure the JSON is properly formatted and valid.
-        """
+        if not posts:
+            raise ValueError("No post variations could be generated")
         
-        # Generate content with Gemini
-        response = model.generate_content(prompt)
+        # Add the suggested hashtags to variations that came back without any
+        if hashtags:
+            for post in posts:
+                if '#' not in post["content"]:
+                    post["content"] += "\n\n" + " ".join(hashtags)
         
-        # Parse the response
-        try:
-            result = json.loads(response.text)
-            return result["posts"]
-        except json.JSONDecodeError:
-            # If JSON parsing fails, try to extract JSON from the response text
-            import re
-            json_pattern = r'({[\s\S]*})'
-            match = re.search(json_pattern, response.text)
-            
-            if match:
-                result = json.loads(match.group(1))
-                return result["posts"]
-            else:
-                raise ValueError("Could not parse JSON from Gemini response")
+        return posts, hashtags
     
     except Exception as e:
         print(f"Error generating posts: {str(e)}")
@@ -139,7 +456,7 @@ def generate_post(topic, tone="Conversational", include_cta=True, max_length=500
                 "estimated_engagement": 45
             }
         ]
-        return fallback_posts
+        return fallback_posts, []
 
 def update_feedback_preferences(feedback_data):
     """
@@ -168,8 +485,7 @@ def update_feedback_preferences(feedback_data):
         
         # Update length preference
         if 'content' in positive_feedback.columns:
-            positive_feedback['content_length'] = positive_feedback['content'].apply(len)
-            avg_length = positive_feedback['content_length'].mean()
+            avg_length = positive_feedback['content'].str.len().mean()
             
             if avg_length < 200:
                 user_preferences['optimal_length'] = 'short'
@@ -197,20 +513,6 @@ def generate_hashtags(topic, num_hashtags=3):
         list: List of hashtags
     """
     try:
-        # Configure Gemini model
-        generation_config = {
-            "temperature": 0.7,
-            "top_p": 0.9,
-            "top_k": 40,
-            "max_output_tokens": 200,
-        }
-        
-        # Setting up the model with Gemini-1.5-pro
-        model = genai.GenerativeModel(
-            model_name="gemini-1.5-pro",
-            generation_config=generation_config
-        )
-        
         # System instruction and prompt
         prompt = f"""
         You are a social media hashtag expert.
@@ -224,29 +526,18 @@ def generate_hashtags(topic, num_hashtags=3):
         """
         
         # Generate content with Gemini
-        response = model.generate_content(prompt)
+        text = _call_gemini(prompt, 200)
         
         # Parse the response
         try:
-            result = json.loads(response.text)
-            return result.get("hashtags", [])
-        except json.JSONDecodeError:
-            # If JSON parsing fails, try to extract JSON from the response text
-            import re
-            json_pattern = r'({[\s\S]*})'
-            match = re.search(json_pattern, response.text)
-            
-            if match:
-                result = json.loads(match.group(1))
-                return result.get("hashtags", [])
+            return _parse_json_payload(text)["hashtags"]
+        except ValueError:
+            # Try to extract hashtags directly
+            hashtags = _HASHTAG_RE.findall(text)
+            if hashtags:
+                return hashtags[:num_hashtags]
             else:
-                # Try to extract hashtags directly
-                hashtag_pattern = r'#\w+'
-                hashtags = re.findall(hashtag_pattern, response.text)
-                if hashtags:
-                    return hashtags[:num_hashtags]
-                else:
-                    raise ValueError("Could not parse hashtags from Gemini response")
+                raise ValueError("Could not parse hashtags from Gemini response")
     
     except Exception as e:
         print(f"Error generating hashtags: {str(e)}")
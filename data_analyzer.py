@@ -1,9 +1,54 @@
+import re
 import pandas as pd
 import numpy as np
 from datetime import datetime
-import matplotlib.pyplot as plt
 from collections import Counter, defaultdict
 
+# Hashtags as they appear in post text
+_HASHTAG_RE = re.compile(r'#\w+')
+
+# Hour part of a post time such as '7:15' or '14:30'
+_HOUR_PATTERN = r'^(?P<hour>\d{1,2}):'
+
+# Content length bins used by analyze_engagement_factors
+_LENGTH_BIN_EDGES = np.array([0, 100, 250, 500, 1000, 2000])
+_LENGTH_BIN_LABELS = np.array(['Very Short', 'Short', 'Medium', 'Long', 'Very Long'], dtype=object)
+
+def _extract_hours(posts_df):
+    """
+    Parses the posting hour from the 'time' column.
+    
+    Args:
+        posts_df (pd.DataFrame): DataFrame containing post data
+        
+    Returns:
+        np.ndarray: Hour of day for each post, or None if any time is malformed
+    """
+    times = posts_df['time']
+    if not pd.api.types.is_string_dtype(times):
+        return None
+    
+    # Times look like '7:15', so take the digits before ':' rather than a fixed width
+    hours = pd.to_numeric(times.str.extract(_HOUR_PATTERN, expand=False), errors='coerce')
+    if hours.isna().any() or not hours.between(0, 23).all():
+        return None
+    return hours.to_numpy(dtype=np.int64)
+
+def _bool_feature_sums(bools, engagement):
+    """
+    Sums engagement with and without each boolean feature using NumPy.
+    
+    Args:
+        bools (np.ndarray): N x F boolean matrix, one column per feature
+        engagement (np.ndarray): Engagement score per row
+        
+    Returns:
+        tuple: (sum_with, count_with, sum_without, count_without), one entry per feature
+    """
+    sum_with = engagement @ bools.astype(np.float64)
+    count_with = bools.sum(axis=0)
+    return sum_with, count_with, engagement.sum() - sum_with, len(engagement) - count_with
+
 def analyze_post_engagement(posts_df):
     """
     Analyzes engagement metrics across different types of posts.
@@ -17,8 +62,22 @@ def analyze_post_engagement(posts_df):
     if posts_df.empty:
         return pd.Series()
     
-    # Average engagement by post type
-    engagement_by_type = posts_df.groupby('type')['engagement'].mean().sort_values(ascending=False)
+    # Average engagement by post type, via per-type sums and counts over the categorical codes
+    post_types = posts_df['type'].astype('category')
+    codes = post_types.cat.codes.to_numpy()
+    engagement = posts_df['engagement'].to_numpy(dtype=np.float64)
+    
+    # Code -1 marks a missing type, which is left out like groupby does
+    known = codes >= 0
+    n_types = len(post_types.cat.categories)
+    sums = np.bincount(codes[known], weights=engagement[known], minlength=n_types)
+    counts = np.bincount(codes[known], minlength=n_types)
+    present = np.flatnonzero(counts)
+    means = sums[present] / counts[present]
+    
+    order = np.argsort(-means, kind='stable')
+    types = post_types.cat.categories[present[order]]
+    engagement_by_type = pd.Series(means[order], index=pd.Index(types, name='type'), name='engagement')
     return engagement_by_type
 
 def analyze_posting_patterns(posts_df):
@@ -35,15 +94,22 @@ def analyze_posting_patterns(posts_df):
         return pd.Series()
     
     # Extract hour from time
-    try:
-        posts_df['hour'] = posts_df['time'].apply(lambda x: int(x.split(':')[0]))
-        
-        # Average engagement by hour
-        engagement_by_hour = posts_df.groupby('hour')['engagement'].mean()
-        return engagement_by_hour
-    except:
+    hours = _extract_hours(posts_df)
+    if hours is None:
         # If time format is inconsistent, return empty series
         return pd.Series()
+    engagement = posts_df['engagement'].to_numpy(dtype=np.float64)
+    
+    # Average engagement by hour, for the hours that have posts
+    sums = np.bincount(hours, weights=engagement, minlength=24)
+    counts = np.bincount(hours, minlength=24)
+    posted = np.flatnonzero(counts)
+    engagement_by_hour = pd.Series(
+        sums[posted] / counts[posted],
+        index=pd.Index(posted, name='hour'),
+        name='engagement'
+    )
+    return engagement_by_hour
 
 def analyze_content_themes(posts_df):
     """
@@ -60,18 +126,22 @@ def analyze_content_themes(posts_df):
     
     theme_analysis = {}
     
+    # Overall average, shared by every comparison below
+    overall_mean = posts_df['engagement'].mean()
+    
     # Analyze by content theme
     if 'theme' in posts_df.columns:
-        theme_engagement = posts_df.groupby('theme')['engagement'].agg(['mean', 'count']).sort_values('mean', ascending=False)
+        theme_engagement = posts_df.groupby('theme', observed=True)['engagement'].agg(['mean', 'count']).sort_values('mean', ascending=False)
         
-        for theme, data in theme_engagement.iterrows():
-            avg_engagement = data['mean']
-            count = data['count']
-            
+        for theme, avg_engagement, count in zip(
+            theme_engagement.index,
+            theme_engagement['mean'].to_numpy(),
+            theme_engagement['count'].to_numpy()
+        ):
             # Generate observations based on engagement
-            if avg_engagement > posts_df['engagement'].mean() * 1.2:
+            if avg_engagement > overall_mean * 1.2:
                 observation = f"High engagement ({avg_engagement:.1f}). Consider creating more content on this theme."
-            elif avg_engagement < posts_df['engagement'].mean() * 0.8:
+            elif avg_engagement < overall_mean * 0.8:
                 observation = f"Low engagement ({avg_engagement:.1f}). This theme may not resonate with your audience."
             else:
                 observation = f"Average engagement ({avg_engagement:.1f}). Consistent performer."
@@ -84,15 +154,15 @@ def analyze_content_themes(posts_df):
     
     # Analyze by content length
     if 'content_length_type' in posts_df.columns:
-        length_engagement = posts_df.groupby('content_length_type')['engagement'].mean().sort_values(ascending=False)
+        length_engagement = posts_df.groupby('content_length_type', observed=True)['engagement'].mean().sort_values(ascending=False)
         
         for length_type, avg_engagement in length_engagement.items():
             if length_type not in theme_analysis:
                 theme_analysis[length_type] = {}
                 
-            if avg_engagement > posts_df['engagement'].mean() * 1.1:
+            if avg_engagement > overall_mean * 1.1:
                 observation = f"{length_type.title()} posts perform well ({avg_engagement:.1f})"
-            elif avg_engagement < posts_df['engagement'].mean() * 0.9:
+            elif avg_engagement < overall_mean * 0.9:
                 observation = f"{length_type.title()} posts underperform ({avg_engagement:.1f})"
             else:
                 observation = f"{length_type.title()} posts have average performance ({avg_engagement:.1f})"
@@ -125,12 +195,14 @@ def analyze_content_themes(posts_df):
     
     return theme_analysis
 
-def get_optimal_posting_time(posts_df):
+def get_optimal_posting_time(posts_df, engagement_by_hour=None):
     """
     Determines the optimal posting time based on engagement patterns.
     
     Args:
         posts_df (pd.DataFrame): DataFrame containing post data
+        engagement_by_hour (pd.Series, optional): Result of analyze_posting_patterns,
+            reused instead of grouping the posts again
         
     Returns:
         str: Recommended posting time
@@ -138,30 +210,25 @@ def get_optimal_posting_time(posts_df):
     if posts_df.empty or 'time' not in posts_df.columns:
         return "Not enough data to determine optimal posting time"
     
-    try:
-        # Extract hour from time
-        posts_df['hour'] = posts_df['time'].apply(lambda x: int(x.split(':')[0]))
-        
-        # Get average engagement by hour
-        engagement_by_hour = posts_df.groupby('hour')['engagement'].mean()
+    # Get average engagement by hour, unless the caller already has it
+    if engagement_by_hour is None:
+        engagement_by_hour = analyze_posting_patterns(posts_df)
+    
+    if not engagement_by_hour.empty:
+        # Find hour with highest engagement
+        best_hour = engagement_by_hour.idxmax()
         
-        if not engagement_by_hour.empty:
-            # Find hour with highest engagement
-            best_hour = engagement_by_hour.idxmax()
+        # Format as a readable time
+        if best_hour < 12:
+            time_str = f"{best_hour}:00 AM"
+        elif best_hour == 12:
+            time_str = "12:00 PM"
+        else:
+            time_str = f"{best_hour-12}:00 PM"
             
-            # Format as a readable time
-            if best_hour < 12:
-                time_str = f"{best_hour}:00 AM"
-            elif best_hour == 12:
-                time_str = "12:00 PM"
-            else:
-                time_str = f"{best_hour-12}:00 PM"
-                
-            return time_str
-        
-        return "Not enough data to determine optimal posting time"
-    except:
-        return "Error analyzing posting times"
+        return time_str
+    
+    return "Not enough data to determine optimal posting time"
 
 def extract_hashtags(posts_df):
     """
@@ -176,14 +243,9 @@ def extract_hashtags(posts_df):
     if posts_df.empty or 'content' not in posts_df.columns:
         return []
     
-    # Extract hashtags from content
-    all_hashtags = []
-    
-    for content in posts_df['content']:
-        # Find all hashtags in the content
-        if isinstance(content, str):
-            hashtags = [tag.strip().lower() for tag in content.split() if tag.startswith('#')]
-            all_hashtags.extend(hashtags)
+    # Extract hashtags from all content in one pass over the joined text
+    corpus = '\n'.join(content for content in posts_df['content'].to_numpy() if isinstance(content, str))
+    all_hashtags = _HASHTAG_RE.findall(corpus.lower())
     
     # Count hashtag frequency
     hashtag_counts = Counter(all_hashtags)
@@ -208,33 +270,48 @@ def analyze_engagement_factors(posts_df):
     
     # Analyze post length vs engagement
     if 'content_length' in posts_df.columns:
-        # Bin post lengths
-        posts_df['length_bin'] = pd.cut(
-            posts_df['content_length'], 
-            bins=[0, 100, 250, 500, 1000, 2000],
-            labels=['Very Short', 'Short', 'Medium', 'Long', 'Very Long']
-        )
+        # Bin post lengths into the right-closed ranges (0, 100], (100, 250], ... (1000, 2000]
+        lengths = posts_df['content_length'].to_numpy(dtype=np.float64)
+        bin_ids = np.searchsorted(_LENGTH_BIN_EDGES, lengths, side='left') - 1
+        in_range = (bin_ids >= 0) & (bin_ids < len(_LENGTH_BIN_LABELS))
         
-        length_engagement = posts_df.groupby('length_bin')['engagement'].mean().sort_values(ascending=False)
-        factors['content_length'] = {
-            'best': length_engagement.index[0],
-            'worst': length_engagement.index[-1],
-            'data': length_engagement.to_dict()
-        }
-    
-    # Boolean features analysis
-    bool_features = ['has_hashtags', 'has_links', 'has_questions', 'has_mentions']
-    
-    for feature in bool_features:
-        if feature in posts_df.columns:
-            feature_engagement = posts_df.groupby(feature)['engagement'].mean()
-            
-            if True in feature_engagement and False in feature_engagement:
-                feature_impact = (feature_engagement[True] / feature_engagement[False] - 1) * 100
+        # Mean engagement per non-empty bin, best first
+        engagement = posts_df['engagement'].to_numpy(dtype=np.float64)
+        sums = np.bincount(bin_ids[in_range], weights=engagement[in_range], minlength=len(_LENGTH_BIN_LABELS))
+        counts = np.bincount(bin_ids[in_range], minlength=len(_LENGTH_BIN_LABELS))
+        filled = np.flatnonzero(counts)
+        
+        if filled.size:
+            means = sums[filled] / counts[filled]
+            order = np.argsort(-means, kind='stable')
+            length_engagement = dict(zip(_LENGTH_BIN_LABELS[filled[order]].tolist(), means[order].tolist()))
+            ranked = list(length_engagement)
+            factors['content_length'] = {
+                'best': ranked[0],
+                'worst': ranked[-1],
+                'data': length_engagement
+            }
+    
+    # Boolean features analysis, all features aggregated in one pass
+    bool_features = [
+        feature for feature in ['has_hashtags', 'has_links', 'has_questions', 'has_mentions']
+        if feature in posts_df.columns
+    ]
+    
+    if bool_features:
+        bools = posts_df[bool_features].to_numpy(dtype=np.bool_)
+        engagement = posts_df['engagement'].to_numpy(dtype=np.float64)
+        sum_with, count_with, sum_without, count_without = _bool_feature_sums(bools, engagement)
+        
+        for j, feature in enumerate(bool_features):
+            if count_with[j] and count_without[j]:
+                with_feature = sum_with[j] / count_with[j]
+                without_feature = sum_without[j] / count_without[j]
+                feature_impact = (with_feature / without_feature - 1) * 100
                 
                 factors[feature] = {
-                    'with': feature_engagement[True],
-                    'without': feature_engagement[False],
+                    'with': with_feature,
+                    'without': without_feature,
                     'impact_percent': feature_impact
                 }
     
@@ -1,131 +1,288 @@
 import os
 import sqlite3
+import threading
 import pandas as pd
-from datetime import datetime
+from contextlib import contextmanager
+from datetime import date, datetime
 
 # Database file path
 DB_FILE = 'linkedin_data.db'
 
-def initialize_database():
+# One connection per thread, so reads run in parallel under WAL; the lock serializes writes only
+_local = threading.local()
+_write_lock = threading.RLock()
+
+def _get_conn():
     """
-    Initializes the SQLite database with necessary tables.
+    Returns the calling thread's database connection, opening it on first use.
+    
+    Returns:
+        sqlite3.Connection: Connection owned by the current thread
     """
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(DB_FILE)
+        # Safe with WAL and avoids an fsync on every commit
+        conn.execute('PRAGMA synchronous=NORMAL')
+        _local.conn = conn
+    return conn
+
+@contextmanager
+def _transaction():
+    """
+    Holds the write lock for a write, committing on success and rolling back on error.
     
-    # Create tables if they don't exist
+    Yields:
+        sqlite3.Connection: Connection owned by the current thread
+    """
+    with _write_lock:
+        conn = _get_conn()
+        with conn:
+            yield conn
+
+# Incremented on every write so callers can cheaply tell when cached reads are stale
+_data_version = 0
+
+def get_data_version():
+    """
+    Returns a counter that changes whenever data is written to the database.
     
-    # Profiles table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS profiles (
-        profile_url TEXT PRIMARY KEY,
-        username TEXT,
-        name TEXT,
-        headline TEXT,
-        location TEXT,
-        connections INTEGER,
-        avg_engagement REAL,
-        last_updated TIMESTAMP
-    )
-    ''')
+    Returns:
+        int: Current data version
+    """
+    return _data_version
+
+def _bump_data_version():
+    """
+    Marks the data as changed, so reads cached on the data version are refreshed.
+    """
+    global _data_version
+    _data_version += 1
+
+def _table_columns(cursor, table):
+    """
+    Returns the column names of a table, or an empty list if it doesn't exist.
     
-    # Posts table
+    Args:
+        cursor (sqlite3.Cursor): Database cursor
+        table (str): Table name
+        
+    Returns:
+        list: Column names
+    """
+    return [row[1] for row in cursor.execute(f'PRAGMA table_info({table})')]
+
+def _migrate_legacy_profiles(cursor):
+    """
+    Copies profiles keyed by profile URL into the table keyed by integer id.
+    
+    Args:
+        cursor (sqlite3.Cursor): Database cursor, with legacy_profiles present
+    """
+    # Profiles saved since an interrupted upgrade are newer, so they win over the legacy copy
     cursor.execute('''
-    CREATE TABLE IF NOT EXISTS posts (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        profile_url TEXT,
-        date TEXT,
-        time TEXT,
-        content TEXT,
-        type TEXT,
-        theme TEXT,
-        content_length INTEGER,
-        content_length_type TEXT,
-        likes INTEGER,
-        comments INTEGER,
-        shares INTEGER,
-        engagement REAL,
-        has_hashtags BOOLEAN,
-        has_links BOOLEAN,
-        has_questions BOOLEAN,
-        has_mentions BOOLEAN,
-        FOREIGN KEY (profile_url) REFERENCES profiles(profile_url)
-    )
+    INSERT OR IGNORE INTO profiles
+    (profile_url, username, name, headline, location, connections, avg_engagement, last_updated)
+    SELECT profile_url, username, name, headline, location, connections, avg_engagement, last_updated
+    FROM legacy_profiles
     ''')
+    cursor.execute('DROP TABLE legacy_profiles')
+
+def _migrate_legacy_posts(cursor, keyed_by_url):
+    """
+    Copies posts with stored length and flag columns into the table that generates them.
     
-    # Generated posts table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS generated_posts (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        content TEXT,
-        topic TEXT,
-        tone TEXT,
-        include_cta BOOLEAN,
-        include_hashtags BOOLEAN,
-        feedback TEXT,
-        generation_time TIMESTAMP,
-        scheduled_time TIMESTAMP NULL
-    )
+    Args:
+        cursor (sqlite3.Cursor): Database cursor, with legacy_posts present
+        keyed_by_url (bool): Whether the legacy posts reference profiles by URL rather than id
+    """
+    if keyed_by_url:
+        profile_join = 'LEFT JOIN profiles ON profiles.profile_url = legacy_posts.profile_url'
+        profile_id = 'profiles.id'
+    else:
+        profile_join = ''
+        profile_id = 'legacy_posts.profile_id'
+    # Fresh ids, in the legacy order, so rows saved since an interrupted upgrade can't collide
+    cursor.execute(f'''
+    INSERT INTO posts
+    (profile_id, date, time, content, type, theme, content_length_type, likes, comments, shares, engagement)
+    SELECT {profile_id}, date, time, content, type, theme, content_length_type,
+    likes, comments, shares, engagement
+    FROM legacy_posts
+    {profile_join}
+    ORDER BY legacy_posts.id
     ''')
+    cursor.execute('DROP TABLE legacy_posts')
+
+def initialize_database():
+    """
+    Initializes the SQLite database with necessary tables.
+    """
+    # Write-ahead logging lets reads proceed during writes; the setting persists in the file.
+    # It can't be changed inside a transaction, so it is set before the schema work below
+    with _write_lock:
+        _get_conn().execute('PRAGMA journal_mode=WAL')
+    
+    with _transaction() as conn:
+        cursor = conn.cursor()
+        
+        # SQLite DDL is transactional, so an explicit transaction makes the renames, creates,
+        # copies and drops below all-or-nothing; sqlite3 would otherwise autocommit the DDL
+        cursor.execute('BEGIN')
+        
+        # Tables from older versions of the schema are rebuilt into the new ones below:
+        # profiles from before they had integer ids, posts from before the length and flags were generated
+        profiles_columns = _table_columns(cursor, 'profiles')
+        if profiles_columns and 'id' not in profiles_columns:
+            cursor.execute('ALTER TABLE profiles RENAME TO legacy_profiles')
+        # A legacy table left by an interrupted upgrade is picked up here as well
+        rebuild_profiles = bool(_table_columns(cursor, 'legacy_profiles'))
+        
+        legacy_posts_columns = _table_columns(cursor, 'legacy_posts')
+        if not legacy_posts_columns:
+            posts_columns = _table_columns(cursor, 'posts')
+            if 'content_length' in posts_columns:
+                cursor.execute('ALTER TABLE posts RENAME TO legacy_posts')
+                legacy_posts_columns = posts_columns
+        rebuild_posts = bool(legacy_posts_columns)
+        
+        # Create tables if they don't exist
+        
+        # Profiles table
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS profiles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            profile_url TEXT UNIQUE,
+            username TEXT,
+            name TEXT,
+            headline TEXT,
+            location TEXT,
+            connections INTEGER,
+            avg_engagement REAL,
+            last_updated TIMESTAMP
+        )
+        ''')
+        
+        # Posts table
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            profile_id INTEGER,
+            date TEXT,
+            time TEXT,
+            content TEXT,
+            type TEXT,
+            theme TEXT,
+            content_length_type TEXT,
+            likes INTEGER,
+            comments INTEGER,
+            shares INTEGER,
+            engagement REAL,
+            -- Derived from content by SQLite, so they are computed once on write and never go stale
+            content_length INTEGER GENERATED ALWAYS AS (length(content)) STORED,
+            has_hashtags BOOLEAN GENERATED ALWAYS AS (instr(content, '#') > 0) STORED,
+            has_links BOOLEAN GENERATED ALWAYS AS (instr(content, 'http') > 0) STORED,
+            has_questions BOOLEAN GENERATED ALWAYS AS (instr(content, '?') > 0) STORED,
+            has_mentions BOOLEAN GENERATED ALWAYS AS (instr(content, '@') > 0) STORED,
+            FOREIGN KEY (profile_id) REFERENCES profiles(id)
+        )
+        ''')
+        
+        # Generated posts table
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS generated_posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content TEXT,
+            topic TEXT,
+            tone TEXT,
+            include_cta BOOLEAN,
+            include_hashtags BOOLEAN,
+            feedback TEXT,
+            generation_time TIMESTAMP,
+            scheduled_time TIMESTAMP NULL
+        )
+        ''')
+        
+        if rebuild_profiles:
+            _migrate_legacy_profiles(cursor)
+        if rebuild_posts:
+            _migrate_legacy_posts(cursor, keyed_by_url='profile_url' in legacy_posts_columns)
+        
+        # Indexes for per-profile, per-type and per-feedback lookups
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_profile ON posts(profile_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_type ON posts(type)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_gp_feedback ON generated_posts(feedback)')
+        # Partial index over scheduled posts only, used by get_scheduled_posts
+        cursor.execute(
+            'CREATE INDEX IF NOT EXISTS idx_gp_sched ON generated_posts(scheduled_time) '
+            'WHERE scheduled_time IS NOT NULL'
+        )
+
+def _column_list(values):
+    """
+    Returns a column of values as a plain Python list.
     
-    conn.commit()
-    conn.close()
+    Args:
+        values (np.ndarray or list): Column values
+        
+    Returns:
+        list: Column values
+    """
+    return values.tolist() if hasattr(values, 'tolist') else list(values)
 
 def save_profile(profile_data):
     """
     Saves profile data to the database.
     
     Args:
-        profile_data (dict): Profile data to save
+        profile_data (dict): Profile data to save, with its posts stored column-wise under 'columns'
     """
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    
-    # Insert or update profile
-    cursor.execute('''
-    INSERT OR REPLACE INTO profiles 
-    (profile_url, username, name, headline, location, connections, avg_engagement, last_updated)
-    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        profile_data['url'],
-        profile_data['username'],
-        profile_data['name'],
-        profile_data.get('headline', ''),
-        profile_data.get('location', ''),
-        profile_data.get('connections', 0),
-        profile_data.get('avg_engagement', 0),
-        datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    ))
-    
-    # Save posts
-    if 'posts' in profile_data and profile_data['posts']:
-        for post in profile_data['posts']:
-            cursor.execute('''
+    with _transaction() as conn:
+        cursor = conn.cursor()
+        
+        # Insert or update profile, keeping its id so existing posts stay attached
+        cursor.execute('''
+        INSERT INTO profiles
+        (profile_url, username, name, headline, location, connections, avg_engagement, last_updated)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(profile_url) DO UPDATE SET
+            username = excluded.username,
+            name = excluded.name,
+            headline = excluded.headline,
+            location = excluded.location,
+            connections = excluded.connections,
+            avg_engagement = excluded.avg_engagement,
+            last_updated = excluded.last_updated
+        ''', (
+            profile_data['url'],
+            profile_data['username'],
+            profile_data['name'],
+            profile_data.get('headline', ''),
+            profile_data.get('location', ''),
+            profile_data.get('connections', 0),
+            profile_data.get('avg_engagement', 0),
+            datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        ))
+        
+        # Save posts in one batched statement, zipping the post columns back into rows
+        columns = profile_data.get('columns')
+        if columns and len(columns['content']) > 0:
+            cursor.execute('SELECT id FROM profiles WHERE profile_url = ?', (profile_data['url'],))
+            profile_id = cursor.fetchone()[0]
+            # tolist() turns NumPy scalars into the plain Python values sqlite3 can bind
+            values = [
+                _column_list(columns[name])
+                for name in ('date', 'time', 'content', 'type', 'theme', 'content_length_type',
+                             'likes', 'comments', 'shares', 'engagement')
+            ]
+            rows = [(profile_id, *row) for row in zip(*values)]
+            cursor.executemany('''
             INSERT INTO posts
-            (profile_url, date, time, content, type, theme, content_length, content_length_type,
-            likes, comments, shares, engagement, has_hashtags, has_links, has_questions, has_mentions)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                profile_data['url'],
-                post.get('date', ''),
-                post.get('time', ''),
-                post.get('content', ''),
-                post.get('type', ''),
-                post.get('theme', ''),
-                post.get('content_length', 0),
-                post.get('content_length_type', ''),
-                post.get('likes', 0),
-                post.get('comments', 0),
-                post.get('shares', 0),
-                post.get('engagement', 0),
-                post.get('has_hashtags', False),
-                post.get('has_links', False),
-                post.get('has_questions', False),
-                post.get('has_mentions', False)
-            ))
-    
-    conn.commit()
-    conn.close()
+            (profile_id, date, time, content, type, theme, content_length_type, likes, comments, shares, engagement)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+    
+    _bump_data_version()
 
 def get_profiles():
     """
@@ -134,28 +291,31 @@ def get_profiles():
     Returns:
         pd.DataFrame: DataFrame containing profile data
     """
-    conn = sqlite3.connect(DB_FILE)
-    
     query = "SELECT * FROM profiles"
-    profiles_df = pd.read_sql_query(query, conn)
-    
-    conn.close()
+    profiles_df = pd.read_sql_query(query, _get_conn())
     
     return profiles_df
 
-def get_posts():
+def get_posts(columns=None):
     """
     Retrieves all posts from the database.
     
+    Args:
+        columns (list, optional): Column names to load. All columns are loaded when omitted.
+    
     Returns:
         pd.DataFrame: DataFrame containing post data
     """
-    conn = sqlite3.connect(DB_FILE)
+    query = f"SELECT {', '.join(columns) if columns else '*'} FROM posts"
+    # Arrow-backed columns hold the post text far more compactly than Python objects
+    posts_df = pd.read_sql_query(query, _get_conn(), dtype_backend='pyarrow')
     
-    query = "SELECT * FROM posts"
-    posts_df = pd.read_sql_query(query, conn)
-    
-    conn.close()
+    # Low-cardinality text becomes categorical and SQLite's 0/1 flags become real booleans
+    for col in posts_df.columns.intersection(['type', 'theme', 'content_length_type']):
+        posts_df[col] = posts_df[col].astype('category')
+    # The generated flags are NULL for posts without content, which counts as not having the feature
+    for col in posts_df.columns.intersection(['has_hashtags', 'has_links', 'has_questions', 'has_mentions']):
+        posts_df[col] = posts_df[col].fillna(0).astype(bool)
     
     return posts_df
 
@@ -172,26 +332,25 @@ def save_generated_post(content, topic, tone, include_cta, include_hashtags, fee
         feedback (str): User feedback on the post
         scheduled_time (str, optional): Scheduled posting time
     """
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-    INSERT INTO generated_posts
-    (content, topic, tone, include_cta, include_hashtags, feedback, generation_time, scheduled_time)
-    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        content,
-        topic,
-        tone,
-        include_cta,
-        include_hashtags,
-        feedback,
-        datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        scheduled_time
-    ))
-    
-    conn.commit()
-    conn.close()
+    with _transaction() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+        INSERT INTO generated_posts
+        (content, topic, tone, include_cta, include_hashtags, feedback, generation_time, scheduled_time)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            content,
+            topic,
+            tone,
+            include_cta,
+            include_hashtags,
+            feedback,
+            datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            scheduled_time
+        ))
+    
+    _bump_data_version()
 
 def update_post_feedback(post_id, feedback):
     """
@@ -201,17 +360,16 @@ def update_post_feedback(post_id, feedback):
         post_id (int): ID of the post
         feedback (str): User feedback
     """
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-    UPDATE generated_posts
-    SET feedback = ?
-    WHERE id = ?
-    ''', (feedback, post_id))
-    
-    conn.commit()
-    conn.close()
+    with _transaction() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+        UPDATE generated_posts
+        SET feedback = ?
+        WHERE id = ?
+        ''', (feedback, post_id))
+    
+    _bump_data_version()
 
 def get_post_feedback():
     """
@@ -220,12 +378,8 @@ def get_post_feedback():
     Returns:
         pd.DataFrame: DataFrame containing feedback data
     """
-    conn = sqlite3.connect(DB_FILE)
-    
     query = "SELECT * FROM generated_posts"
-    feedback_df = pd.read_sql_query(query, conn)
-    
-    conn.close()
+    feedback_df = pd.read_sql_query(query, _get_conn())
     
     return feedback_df
 
@@ -236,35 +390,48 @@ def get_post_feedback_stats():
     Returns:
         dict: Feedback statistics
     """
-    feedback_df = get_post_feedback()
-    
-    if feedback_df.empty:
+    # Aggregate in SQLite so only a few summary rows reach Python
+    conn = _get_conn()
+    tone_rows = conn.execute('''
+    SELECT tone, COUNT(*), TOTAL(feedback = 'positive')
+    FROM generated_posts
+    GROUP BY tone
+    ORDER BY MIN(id)
+    ''').fetchall()
+    # No generated posts yet, skip the trend query
+    if not tone_rows:
         return None
+    trend_rows = conn.execute('''
+    SELECT substr(generation_time, 1, 10) AS generation_date, 100.0 * TOTAL(feedback = 'positive') / COUNT(*)
+    FROM generated_posts
+    WHERE generation_time IS NOT NULL
+    GROUP BY generation_date
+    ORDER BY generation_date
+    ''').fetchall()
     
     # Basic stats
-    total_posts = len(feedback_df)
-    positive_feedback = len(feedback_df[feedback_df['feedback'] == 'positive'])
+    total_posts = sum(count for _, count, _ in tone_rows)
+    positive_feedback = int(sum(positive for _, _, positive in tone_rows))
     positive_percentage = (positive_feedback / total_posts) * 100 if total_posts > 0 else 0
     
     # Tone effectiveness
-    tone_effectiveness = {}
-    if 'tone' in feedback_df.columns:
-        for tone in feedback_df['tone'].unique():
-            tone_posts = feedback_df[feedback_df['tone'] == tone]
-            tone_positive = len(tone_posts[tone_posts['feedback'] == 'positive'])
-            tone_total = len(tone_posts)
-            tone_effectiveness[tone] = (tone_positive / tone_total) * 100 if tone_total > 0 else 0
+    tone_effectiveness = {
+        tone: (positive / count) * 100
+        for tone, count, positive in tone_rows
+    }
     
     # Preferred tone
     preferred_tone = max(tone_effectiveness.items(), key=lambda x: x[1])[0] if tone_effectiveness else None
     
-    # Feedback trend over time
-    if 'generation_time' in feedback_df.columns:
-        feedback_df['generation_date'] = pd.to_datetime(feedback_df['generation_time']).dt.date
-        trend_data = feedback_df.groupby('generation_date')['feedback'].apply(
-            lambda x: (x == 'positive').mean() * 100
+    # Feedback trend over time. generation_time is always written as '%Y-%m-%d %H:%M:%S',
+    # so its first 10 characters are already an ISO date
+    if trend_rows:
+        dates, rates = zip(*trend_rows)
+        feedback_trend = pd.Series(
+            rates,
+            index=pd.Index([date.fromisoformat(day) for day in dates], name='generation_date'),
+            name='feedback'
         )
-        feedback_trend = trend_data
     else:
         feedback_trend = pd.Series()
     
@@ -286,17 +453,16 @@ def schedule_post(post_id, scheduled_time):
         post_id (int): ID of the post
         scheduled_time (str): Scheduled posting time
     """
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-    UPDATE generated_posts
-    SET scheduled_time = ?
-    WHERE id = ?
-    ''', (scheduled_time, post_id))
-    
-    conn.commit()
-    conn.close()
+    with _transaction() as conn:
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+        UPDATE generated_posts
+        SET scheduled_time = ?
+        WHERE id = ?
+        ''', (scheduled_time, post_id))
+    
+    _bump_data_version()
 
 def get_scheduled_posts():
     """
@@ -305,12 +471,8 @@ def get_scheduled_posts():
     Returns:
         pd.DataFrame: DataFrame containing scheduled posts
     """
-    conn = sqlite3.connect(DB_FILE)
-    
     query = "SELECT * FROM generated_posts WHERE scheduled_time IS NOT NULL"
-    scheduled_df = pd.read_sql_query(query, conn)
-    
-    conn.close()
+    scheduled_df = pd.read_sql_query(query, _get_conn())
     
     return scheduled_df
 
@@ -318,126 +480,142 @@ def insert_sample_feedback():
     """
     Inserts sample feedback posts into the database, if no posts exist.
     This function provides demo data for the dashboard when there is no real feedback yet.
+    
+    Returns:
+        tuple: (feedback DataFrame, feedback statistics) for the posts now in the database
     """
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    # Check if there's any feedback already
-    cursor.execute('SELECT COUNT(*) FROM generated_posts')
-    count = cursor.fetchone()[0]
-    if count > 0:
-        conn.close()
-        return  # Do nothing if feedback already exists
-
-    from datetime import datetime, timedelta
-    now = datetime.now()
-    sample_posts = [
-        {
-            "content": "Excited to share my thoughts on AI in marketing! The potential for personalization and customer insights is game-changing. What's your experience with AI tools in your marketing strategy? #AIMarketing #DigitalTransformation #MarketingTrends",
-            "topic": "AI in Marketing",
-            "tone": "Conversational",
-            "include_cta": True,
-            "include_hashtags": True,
-            "feedback": "positive",
-            "generation_time": (now - timedelta(days=14)).strftime('%Y-%m-%d %H:%M:%S')
-        },
-        {
-            "content": "Leadership isn't about having all the answers—it's about asking the right questions. Today I challenged my team to think differently about our quarterly goals, and the insights were invaluable. True growth comes from collaborative problem-solving. #Leadership #TeamDevelopment",
-            "topic": "Leadership",
-            "tone": "Inspirational",
-            "include_cta": False,
-            "include_hashtags": True,
-            "feedback": "positive",
-            "generation_time": (now - timedelta(days=12)).strftime('%Y-%m-%d %H:%M:%S')
-        },
-        {
-            "content": "New research reveals that companies with diverse leadership teams outperform competitors by 35%. This data confirms what we already knew: diversity isn't just good ethics, it's good business. Here's a link to the full study. #DiversityInBusiness #Leadership",
-            "topic": "Diversity in Business",
-            "tone": "Educational",
-            "include_cta": True,
-            "include_hashtags": True,
-            "feedback": "negative",
-            "generation_time": (now - timedelta(days=10)).strftime('%Y-%m-%d %H:%M:%S')
-        },
-        {
-            "content": "Just released our comprehensive guide to remote work best practices. After 2 years of research across 150+ companies, we've identified the key factors that make remote teams successful. Download now (link in comments). #RemoteWork #FutureOfWork #Productivity",
-            "topic": "Remote Work",
-            "tone": "Professional",
-            "include_cta": True,
-            "include_hashtags": True,
-            "feedback": "positive",
-            "generation_time": (now - timedelta(days=8)).strftime('%Y-%m-%d %H:%M:%S')
-        },
-        {
-            "content": "Our Q3 webinar series kicks off next week! Join industry experts as we explore emerging technologies reshaping finance. Reserve your spot now—spaces are limited. #FinTech #DigitalBanking #Innovation",
-            "topic": "FinTech Webinar",
-            "tone": "Promotional",
-            "include_cta": True,
-            "include_hashtags": True,
-            "feedback": "neutral",
-            "generation_time": (now - timedelta(days=6)).strftime('%Y-%m-%d %H:%M:%S')
-        },
-        {
-            "content": "Thrilled to announce our partnership with Green Solutions to reduce our carbon footprint by 40% over the next two years. Sustainability isn't just a goal—it's our responsibility. #Sustainability #ClimateAction",
-            "topic": "Sustainability",
-            "tone": "Inspirational",
-            "include_cta": False,
-            "include_hashtags": True,
-            "feedback": "positive",
-            "generation_time": (now - timedelta(days=4)).strftime('%Y-%m-%d %H:%M:%S')
-        },
-        {
-            "content": "Data privacy matters more than ever. Our new white paper examines how regulations like GDPR and CCPA are impacting global businesses and provides actionable compliance strategies. Check it out and share your thoughts! #DataPrivacy #Compliance #GDPR",
-            "topic": "Data Privacy",
-            "tone": "Educational",
-            "include_cta": True,
-            "include_hashtags": True,
-            "feedback": "positive",
-            "generation_time": (now - timedelta(days=2)).strftime('%Y-%m-%d %H:%M:%S')
-        },
-        {
-            "content": "Just completed the Advanced Business Strategy certification! Grateful for the opportunity to expand my knowledge and connect with amazing professionals in the program. What professional development are you focusing on this quarter? #ProfessionalDevelopment #LifelongLearning",
-            "topic": "Professional Development",
-            "tone": "Conversational",
-            "include_cta": True,
-            "include_hashtags": True,
-            "feedback": "positive",
-            "generation_time": (now - timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S')
-        },
-        {
-            "content": "Breaking: Our new mobile app launches today! After months of user testing and refinement, we're proud to deliver a seamless experience that will transform how you manage your workflow. Download now from the App Store or Google Play. #ProductLaunch #Innovation #MobileApp",
-            "topic": "Product Launch",
-            "tone": "Promotional",
-            "include_cta": True,
-            "include_hashtags": True,
-            "feedback": "negative",
-            "generation_time": now.strftime('%Y-%m-%d %H:%M:%S')
-        },
-        {
-            "content": "Honored to be speaking at next month's Tech Forward Conference on 'Building Ethical AI Systems.' If you're attending, let's connect! #AI #TechEthics #Conference",
-            "topic": "AI Ethics",
-            "tone": "Professional",
-            "include_cta": True,
-            "include_hashtags": True,
-            "feedback": "positive",
-            "generation_time": now.strftime('%Y-%m-%d %H:%M:%S')
-        }
-    ]
-    for post in sample_posts:
-        cursor.execute(
+    # Check and insert under one lock so two sessions can't both seed the table
+    with _transaction() as conn:
+        cursor = conn.cursor()
+        # Check if there's any feedback already
+        cursor.execute('SELECT 1 FROM generated_posts LIMIT 1')
+        if cursor.fetchone() is not None:
+            # Nothing to insert, report what is already there
+            feedback_df = get_post_feedback()
+            return feedback_df, get_post_feedback_stats()
+        
+        from datetime import datetime, timedelta
+        now = datetime.now()
+        sample_posts = [
+            {
+                "content": "Excited to share my thoughts on AI in marketing! The potential for personalization and customer insights is game-changing. What's your experience with AI tools in your marketing strategy? #AIMarketing #DigitalTransformation #MarketingTrends",
+                "topic": "AI in Marketing",
+                "tone": "Conversational",
+                "include_cta": True,
+                "include_hashtags": True,
+                "feedback": "positive",
+                "generation_time": (now - timedelta(days=14)).strftime('%Y-%m-%d %H:%M:%S')
+            },
+            {
+                "content": "Leadership isn't about having all the answers—it's about asking the right questions. Today I challenged my team to think differently about our quarterly goals, and the insights were invaluable. True growth comes from collaborative problem-solving. #Leadership #TeamDevelopment",
+                "topic": "Leadership",
+                "tone": "Inspirational",
+                "include_cta": False,
+                "include_hashtags": True,
+                "feedback": "positive",
+                "generation_time": (now - timedelta(days=12)).strftime('%Y-%m-%d %H:%M:%S')
+            },
+            {
+                "content": "New research reveals that companies with diverse leadership teams outperform competitors by 35%. This data confirms what we already knew: diversity isn't just good ethics, it's good business. Here's a link to the full study. #DiversityInBusiness #Leadership",
+                "topic": "Diversity in Business",
+                "tone": "Educational",
+                "include_cta": True,
+                "include_hashtags": True,
+                "feedback": "negative",
+                "generation_time": (now - timedelta(days=10)).strftime('%Y-%m-%d %H:%M:%S')
+            },
+            {
+                "content": "Just released our comprehensive guide to remote work best practices. After 2 years of research across 150+ companies, we've identified the key factors that make remote teams successful. Download now (link in comments). #RemoteWork #FutureOfWork #Productivity",
+                "topic": "Remote Work",
+                "tone": "Professional",
+                "include_cta": True,
+                "include_hashtags": True,
+                "feedback": "positive",
+                "generation_time": (now - timedelta(days=8)).strftime('%Y-%m-%d %H:%M:%S')
+            },
+            {
+                "content": "Our Q3 webinar series kicks off next week! Join industry experts as we explore emerging technologies reshaping finance. Reserve your spot now—spaces are limited. #FinTech #DigitalBanking #Innovation",
+                "topic": "FinTech Webinar",
+                "tone": "Promotional",
+                "include_cta": True,
+                "include_hashtags": True,
+                "feedback": "neutral",
+                "generation_time": (now - timedelta(days=6)).strftime('%Y-%m-%d %H:%M:%S')
+            },
+            {
+                "content": "Thrilled to announce our partnership with Green Solutions to reduce our carbon footprint by 40% over the next two years. Sustainability isn't just a goal—it's our responsibility. #Sustainability #ClimateAction",
+                "topic": "Sustainability",
+                "tone": "Inspirational",
+                "include_cta": False,
+                "include_hashtags": True,
+                "feedback": "positive",
+                "generation_time": (now - timedelta(days=4)).strftime('%Y-%m-%d %H:%M:%S')
+            },
+            {
+                "content": "Data privacy matters more than ever. Our new white paper examines how regulations like GDPR and CCPA are impacting global businesses and provides actionable compliance strategies. Check it out and share your thoughts! #DataPrivacy #Compliance #GDPR",
+                "topic": "Data Privacy",
+                "tone": "Educational",
+                "include_cta": True,
+                "include_hashtags": True,
+                "feedback": "positive",
+                "generation_time": (now - timedelta(days=2)).strftime('%Y-%m-%d %H:%M:%S')
+            },
+            {
+                "content": "Just completed the Advanced Business Strategy certification! Grateful for the opportunity to expand my knowledge and connect with amazing professionals in the program. What professional development are you focusing on this quarter? #ProfessionalDevelopment #LifelongLearning",
+                "topic": "Professional Development",
+                "tone": "Conversational",
+                "include_cta": True,
+                "include_hashtags": True,
+                "feedback": "positive",
+                "generation_time": (now - timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S')
+            },
+            {
+                "content": "Breaking: Our new mobile app launches today! After months of user testing and refinement, we're proud to deliver a seamless experience that will transform how you manage your workflow. Download now from the App Store or Google Play. #ProductLaunch #Innovation #MobileApp",
+                "topic": "Product Launch",
+                "tone": "Promotional",
+                "include_cta": True,
+                "include_hashtags": True,
+                "feedback": "negative",
+                "generation_time": now.strftime('%Y-%m-%d %H:%M:%S')
+            },
+            {
+                "content": "Honored to be speaking at next month's Tech Forward Conference on 'Building Ethical AI Systems.' If you're attending, let's connect! #AI #TechEthics #Conference",
+                "topic": "AI Ethics",
+                "tone": "Professional",
+                "include_cta": True,
+                "include_hashtags": True,
+                "feedback": "positive",
+                "generation_time": now.strftime('%Y-%m-%d %H:%M:%S')
+            }
+        ]
+        cursor.executemany(
             '''
             INSERT INTO generated_posts
             (content, topic, tone, include_cta, include_hashtags, feedback, generation_time)
             VALUES (?, ?, ?, ?, ?, ?, ?)
             ''',
-            (
-                post["content"],
-                post["topic"],
-                post["tone"],
-                post["include_cta"],
-                post["include_hashtags"],
-                post["feedback"],
-                post["generation_time"]
-            )
+            [
+                (
+                    post["content"],
+                    post["topic"],
+                    post["tone"],
+                    post["include_cta"],
+                    post["include_hashtags"],
+                    post["feedback"],
+                    post["generation_time"]
+                )
+                for post in sample_posts
+            ]
         )
-    conn.commit()
-    conn.close()
+        # lastrowid isn't set by executemany; the table was empty, so every row is ours
+        post_ids = [row[0] for row in cursor.execute('SELECT id FROM generated_posts ORDER BY id')]
+    
+    _bump_data_version()
+    
+    # Build the inserted rows in memory, shaped like get_post_feedback(), instead of reading them back;
+    # the stats are a cheap aggregate query
+    feedback_df = pd.DataFrame(sample_posts)
+    feedback_df.insert(0, 'id', post_ids)
+    feedback_df[['include_cta', 'include_hashtags']] = feedback_df[['include_cta', 'include_hashtags']].astype(int)
+    feedback_df['scheduled_time'] = None
+    return feedback_df, get_post_feedback_stats()